@@ -2,11 +2,11 @@
 """
 LOC History Accumulator
 =======================
-Measures actual lines of code at historical points by checking out past commits
+Measures actual lines of code at historical points by exporting past commits
 and running tokei. Stores results in loc_history.json for use by the dashboard.
 
-Uses a separate temporary clone for historical measurements to avoid disrupting
-any uncommitted work in your actual repositories.
+Historical trees are written to a temporary directory with git archive, so your
+actual repositories (and any uncommitted work in them) are never touched.
 
 Usage:
     # Backfill last 40 days
@@ -17,67 +17,174 @@ Usage:
 
     # Backfill specific date range
     python accumulate_loc_history.py --path /path/to/repos --start 2025-12-01 --end 2026-01-31
+
+    # Keep history in SQLite (rows are upserted, not rewritten) and export JSON for the dashboard
+    python accumulate_loc_history.py --path /path/to/repos --output loc_history.sqlite --export-json loc_history.json
 """
 
 import argparse
 import json
 import os
 import shutil
+import sqlite3
 import subprocess
+import sys
 import tempfile
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
+
+try:
+    import orjson  # Optional: faster parsing of tokei output
+except ImportError:
+    orjson = None
 
 
 LOC_HISTORY_FILE = "loc_history.json"
-TEMP_CLONE_DIR = None  # Will be set to a temp directory
+WORKER_TEMP_DIR = None  # Will be set to a per-worker temp directory
+MAX_WORKERS = min(os.cpu_count() or 1, 8)  # More workers just thrash tokei I/O
+SAVE_EVERY = 5  # Repos between history saves
+# Vendored/generated directories tokei shouldn't even walk (keep in sync with fetch_github_data.py)
+TOKEI_EXCLUDES = ["node_modules", "vendor", ".venv", "dist", "build", "target"]
+SKIPPED_LANGUAGES = ("Total", "HTML", "SVG", "JSON")  # Not counted as code (keep in sync with fetch_github_data.py)
+SHM_DIR = "/dev/shm"
+MIN_SHM_FREE = 1 << 30  # Containers often cap /dev/shm at 64 MB; fall back to disk below 1 GiB
+EMPTY_MEASUREMENT = {"total": 0, "languages": {}}  # Shared by every empty date; never mutated
+SQLITE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS measurements (
+    repo TEXT, date TEXT, total INTEGER, commit_sha TEXT, PRIMARY KEY (repo, date));
+CREATE TABLE IF NOT EXISTS languages (
+    repo TEXT, date TEXT, lang TEXT, code INTEGER, PRIMARY KEY (repo, date, lang));
+CREATE TABLE IF NOT EXISTS tree_languages (
+    repo TEXT, tree TEXT, lang TEXT, code INTEGER, PRIMARY KEY (repo, tree, lang));
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
 
 
-def run_git(repo_path: Path, args: list) -> str:
-    """Run a git command and return stdout."""
+def run_git(repo_path: Path, args: list) -> bytes:
+    """Run a git command and return stdout as bytes (callers decode only what they keep)."""
     result = subprocess.run(
         ["git", "-C", str(repo_path)] + args,
-        capture_output=True, text=True
+        capture_output=True
     )
     return result.stdout.strip()
 
 
+def tokei_command(paths: list, *extra_args) -> list:
+    """Build a tokei JSON-output command line with the standard excludes."""
+    excludes = [arg for pattern in TOKEI_EXCLUDES for arg in ("--exclude", pattern)]
+    return ["tokei", "--output", "json", *extra_args, *excludes] + [str(p) for p in paths]
+
+
 def run_tokei(repo_path: Path) -> dict:
     """Run tokei and return {language: lines} dict."""
     try:
         result = subprocess.run(
-            ["tokei", "--output", "json", str(repo_path)],
-            capture_output=True, text=True, timeout=120
+            tokei_command([repo_path]),
+            capture_output=True, timeout=120
         )
         if result.returncode == 0:
-            data = json.loads(result.stdout)
+            # Both parsers accept raw bytes, which skips a decode pass over the output
+            data = orjson.loads(result.stdout) if orjson else json.loads(result.stdout)
             return {
                 lang: info.get("code", 0)
                 for lang, info in data.items()
-                if lang not in ("Total", "HTML", "SVG", "JSON") and isinstance(info, dict) and info.get("code", 0) > 0
+                if lang not in SKIPPED_LANGUAGES and isinstance(info, dict) and info.get("code", 0) > 0
             }
     except (subprocess.TimeoutExpired, json.JSONDecodeError, FileNotFoundError):
         pass
     return {}
 
 
-def get_commit_at_date(repo_path: Path, date: datetime) -> str:
-    """Get the commit hash that was HEAD at a given date."""
-    date_str = date.strftime("%Y-%m-%d 23:59:59")
-    commit = run_git(repo_path, ["rev-list", "-1", f"--before={date_str}", "HEAD"])
-    return commit
+def run_tokei_many(repo_paths: list) -> dict:
+    """Run tokei once over several repos and return {repo_path: {language: lines}}.
+
+    One invocation lets tokei's own thread pool scan every repo at once; its per-file
+    reports are attributed back to the repo they came from. Returns {} if tokei fails.
+    """
+    if not repo_paths:
+        return {}
+
+    try:
+        result = subprocess.run(
+            tokei_command(repo_paths, "--files"),
+            capture_output=True, timeout=600
+        )
+        if result.returncode != 0:
+            return {}
+        data = orjson.loads(result.stdout) if orjson else json.loads(result.stdout)
+    except (subprocess.TimeoutExpired, json.JSONDecodeError, FileNotFoundError):
+        return {}
+
+    by_path = {str(repo_path): repo_path for repo_path in repo_paths}
+    loc_by_repo = {repo_path: {} for repo_path in repo_paths}
+    for lang, info in data.items():
+        if lang in SKIPPED_LANGUAGES or not isinstance(info, dict):
+            continue
+        for report in info.get("reports", []):
+            code = report.get("stats", {}).get("code", 0)
+            if not code:
+                continue
+            for parent in Path(report["name"]).parents:
+                if str(parent) in by_path:
+                    loc = loc_by_repo[by_path[str(parent)]]
+                    loc[lang] = loc.get(lang, 0) + code
+                    break
+    return loc_by_repo
+
+
+def list_commits(repo_path: Path) -> list:
+    """List (commit timestamp, commit hash, tree hash) along HEAD's first-parent history, oldest first."""
+    output = run_git(repo_path, ["log", "--first-parent", "--format=%ct %H %T", "HEAD"])
+    commits = []
+    for line in output.splitlines():
+        timestamp, commit, tree = line.split()
+        commits.append((int(timestamp), commit.decode(), tree.decode()))
+    # git lists newest first: reverse into history order, then stable-sort on the timestamp only,
+    # so commits sharing a second (rebases, scripted commits) keep their history order
+    commits.reverse()
+    commits.sort(key=lambda c: c[0])
+    return commits
+
+
+def get_commit_at_date(commits: list, commit_times: list, date: datetime) -> tuple:
+    """Get the (commit, tree) that was HEAD at a given date (bisects the output of list_commits)."""
+    cutoff = date.replace(hour=23, minute=59, second=59).timestamp()
+    idx = bisect_right(commit_times, cutoff)
+    return commits[idx - 1][1:] if idx else ("", "")
+
+
+def get_head(repo_path: Path) -> tuple:
+    """Get the (commit, tree) of HEAD, or ("", "") for a repo with no commits."""
+    return tuple(run_git(repo_path, ["log", "-1", "--format=%H %T"]).decode().split()) or ("", "")
+
+
+def is_worktree_clean(repo_path: Path) -> bool:
+    """True if the working tree matches HEAD exactly (no modified or untracked files)."""
+    result = subprocess.run(
+        ["git", "-C", str(repo_path), "status", "--porcelain"],
+        capture_output=True
+    )
+    return result.returncode == 0 and not result.stdout.strip()
 
 
+@lru_cache(maxsize=None)
 def get_repo_created_date(repo_path: Path) -> datetime:
     """Get the date of the first commit in the repo."""
-    # Get all commit dates and take the last one (oldest)
+    # Only list root commits (usually just one) and take the last one (oldest).
+    # Note `log --reverse --max-count=1` would give HEAD: the limit applies before reversing.
     result = subprocess.run(
-        ["git", "-C", str(repo_path), "log", "--format=%aI"],
-        capture_output=True, text=True
+        ["git", "-C", str(repo_path), "log", "--max-parents=0", "--format=%aI", "HEAD"],
+        capture_output=True
     )
     if result.stdout.strip():
-        dates = result.stdout.strip().split('\n')
-        first_commit_date = dates[-1]  # Last line is oldest commit
+        dates = result.stdout.strip().split(b'\n')
+        first_commit_date = dates[-1].decode()  # Last line is oldest commit
         try:
             return datetime.fromisoformat(first_commit_date.replace('Z', '+00:00')).replace(tzinfo=None)
         except ValueError:
@@ -85,51 +192,108 @@ def get_repo_created_date(repo_path: Path) -> datetime:
     return datetime.now()
 
 
-def get_or_create_temp_clone(repo_path: Path, temp_base: Path) -> Path:
-    """Get or create a temporary clone of the repo for safe historical checkouts."""
-    repo_name = repo_path.name
-    temp_clone = temp_base / repo_name
+class GitBatch:
+    """A long-lived `git cat-file --batch-check` process, so object lookups don't fork per query."""
 
-    if not temp_clone.exists():
-        # Clone with --shared to save disk space (uses original repo's objects)
-        subprocess.run(
-            ["git", "clone", "--shared", "--quiet", str(repo_path), str(temp_clone)],
-            capture_output=True, check=True
-        )
-    else:
-        # Fetch latest from original repo
-        subprocess.run(
-            ["git", "-C", str(temp_clone), "fetch", "--quiet", "origin"],
-            capture_output=True
+    def __init__(self, repo_path: Path):
+        self.repo_path = repo_path
+        self.proc = None
+
+    def __enter__(self):
+        self.proc = subprocess.Popen(
+            ["git", "-C", str(self.repo_path), "cat-file",
+             "--batch-check=%(objectname) %(objecttype) %(objectsize)"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
         )
+        return self
+
+    def __exit__(self, *exc):
+        self.proc.stdin.close()
+        self.proc.wait()
+        self.proc.stdout.close()
+
+    def query(self, name: str) -> Optional[tuple]:
+        """Return (oid, type, size) for an object name, or None if it doesn't exist."""
+        self.proc.stdin.write(name.encode() + b"\n")
+        self.proc.stdin.flush()
+        fields = self.proc.stdout.readline().split()
+        if len(fields) != 3:  # "<name> missing" / "<name> ambiguous"
+            return None
+        return fields[0].decode(), fields[1].decode(), int(fields[2])
+
+
+def export_commit(repo_path: Path, commit: str, dest: Path):
+    """Write a commit's tree into dest via git archive; no clone, index or checkout involved."""
+    shutil.rmtree(dest, ignore_errors=True)
+    dest.mkdir(parents=True)
+
+    archive = subprocess.Popen(
+        ["git", "-C", str(repo_path), "archive", "--format=tar", commit],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    extract = subprocess.Popen(
+        ["tar", "-x", "-f", "-", "-C", str(dest)],
+        stdin=archive.stdout, stderr=subprocess.DEVNULL
+    )
+    archive.stdout.close()  # So git sees a broken pipe if tar exits early
+    # Reap both processes before checking either, so a tar failure leaves no zombie git behind
+    tar_status, git_status = extract.wait(), archive.wait()
+    if tar_status or git_status:
+        raise subprocess.CalledProcessError(git_status or tar_status, "git archive")
 
-    return temp_clone
 
+def measure_loc_at_commit(repo_path: Path, commit: str, temp_base: Path) -> Optional[dict]:
+    """Export a commit (or tree) into a temp directory and measure LOC. Original repo is untouched.
 
-def measure_loc_at_commit(repo_path: Path, commit: str, temp_base: Path) -> dict:
-    """Checkout a commit in a temp clone and measure LOC. Original repo is untouched."""
+    Returns None if the tree couldn't be exported (e.g. the temp dir is full), so the
+    caller can skip the date rather than record it as zero lines.
+    """
     if not commit:
         return {}
 
-    # Use a temporary clone for checkout
-    temp_clone = get_or_create_temp_clone(repo_path, temp_base)
+    snapshot = temp_base / repo_path.name
 
     try:
-        # Checkout the historical commit in the temp clone
-        subprocess.run(
-            ["git", "-C", str(temp_clone), "checkout", "--quiet", "--force", commit],
-            capture_output=True, check=True
-        )
+        # Write the historical tree out to the snapshot directory
+        export_commit(repo_path, commit, snapshot)
 
         # Measure LOC
-        loc = run_tokei(temp_clone)
-        return loc
-    except subprocess.CalledProcessError:
-        return {}
+        return run_tokei(snapshot)
+    except (subprocess.CalledProcessError, OSError):
+        return None
+    finally:
+        # Don't let finished snapshots pile up in the (possibly RAM-backed) temp dir
+        shutil.rmtree(snapshot, ignore_errors=True)
+
+
+def init_worker(temp_base: Path):
+    """Give each pool worker its own snapshot directory, keyed by worker PID."""
+    global WORKER_TEMP_DIR
+    WORKER_TEMP_DIR = temp_base / f"worker_{os.getpid()}"
+    WORKER_TEMP_DIR.mkdir(exist_ok=True)
+
+
+def measure_one(repo_path: Path, tree: str) -> tuple:
+    """Measure LOC of a repo's tree. Runs in a pool worker; returns (tree, loc)."""
+    return tree, measure_loc_at_commit(repo_path, tree, WORKER_TEMP_DIR)
+
+
+def make_temp_base() -> Path:
+    """Create the snapshot directory, in RAM (/dev/shm) on Linux when it has room.
+
+    tokei can't read a git archive stream directly, so every snapshot is written out and
+    read back; on tmpfs that round trip never touches the disk.
+    """
+    if (sys.platform.startswith("linux") and os.access(SHM_DIR, os.W_OK)
+            and shutil.disk_usage(SHM_DIR).free >= MIN_SHM_FREE):
+        return Path(tempfile.mkdtemp(prefix="loc_history_", dir=SHM_DIR))
+    return Path(tempfile.mkdtemp(prefix="loc_history_"))
 
 
 def load_history(history_file: Path) -> dict:
     """Load existing LOC history from file."""
+    if is_sqlite_history(history_file):
+        return load_history_sqlite(history_file)
     if history_file.exists():
         with open(history_file) as f:
             return json.load(f)
@@ -137,18 +301,94 @@ def load_history(history_file: Path) -> dict:
 
 
 def save_history(history: dict, history_file: Path):
-    """Save LOC history to file."""
+    """Save LOC history to file (atomically, so an interrupted write never truncates it)."""
     history["last_updated"] = datetime.now(timezone.utc).isoformat()
-    with open(history_file, "w") as f:
-        json.dump(history, f, indent=2)
+    if is_sqlite_history(history_file):
+        save_history_sqlite(history, history_file)
+        return
+
+    if orjson:
+        data = orjson.dumps(history, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(history, indent=2).encode()
+
+    history_file = Path(history_file).resolve()
+    with tempfile.NamedTemporaryFile(dir=history_file.parent, prefix=f".{history_file.name}.",
+                                     delete=False) as f:
+        f.write(data)
+    os.chmod(f.name, 0o644)  # NamedTemporaryFile creates owner-only files
+    os.replace(f.name, history_file)
+
+
+def is_sqlite_history(history_file: Path) -> bool:
+    """History files with a SQLite suffix use the SQLite store instead of JSON."""
+    return Path(history_file).suffix in SQLITE_SUFFIXES
+
+
+def connect_history_db(history_file: Path) -> sqlite3.Connection:
+    """Open (creating if needed) a SQLite LOC history store."""
+    db = sqlite3.connect(history_file)
+    db.executescript(SQLITE_SCHEMA)
+    return db
+
+
+def load_history_sqlite(history_file: Path) -> dict:
+    """Load a SQLite LOC history store into the same dict shape as the JSON file."""
+    history = {"repos": {}, "last_updated": None}
+    with closing(connect_history_db(history_file)) as db:
+        for repo, date_str, total, commit in db.execute(
+                "SELECT repo, date, total, commit_sha FROM measurements ORDER BY repo, date"):
+            repo_history = history["repos"].setdefault(repo, {"measurements": {}, "by_tree": {}})
+            measurement = {"total": total, "languages": {}}
+            if commit:
+                measurement["commit"] = commit
+            repo_history["measurements"][date_str] = measurement
+
+        for repo, date_str, lang, code in db.execute(
+                "SELECT repo, date, lang, code FROM languages ORDER BY rowid"):
+            history["repos"][repo]["measurements"][date_str]["languages"][lang] = code
+
+        for repo, tree, lang, code in db.execute(
+                "SELECT repo, tree, lang, code FROM tree_languages ORDER BY rowid"):
+            repo_history = history["repos"].setdefault(repo, {"measurements": {}, "by_tree": {}})
+            repo_history["by_tree"].setdefault(tree, {})[lang] = code
+
+        row = db.execute("SELECT value FROM meta WHERE key = 'last_updated'").fetchone()
+        history["last_updated"] = row[0] if row else None
+    return history
+
+
+def save_history_sqlite(history: dict, history_file: Path):
+    """Write new measurements to a SQLite LOC history store.
+
+    Recorded measurements never change, so existing rows are left alone (INSERT OR IGNORE
+    against the primary key) and only the new ones are actually written.
+    """
+    measurements, languages, tree_languages = [], [], []
+    for repo, repo_history in history["repos"].items():
+        for date_str, measurement in repo_history["measurements"].items():
+            measurements.append((repo, date_str, measurement["total"], measurement.get("commit")))
+            languages.extend((repo, date_str, lang, code) for lang, code in measurement["languages"].items())
+        for tree, loc in repo_history.get("by_tree", {}).items():
+            tree_languages.extend((repo, tree, lang, code) for lang, code in loc.items())
+
+    with closing(connect_history_db(history_file)) as db:
+        with db:  # One transaction for the whole save
+            db.executemany("INSERT OR IGNORE INTO measurements VALUES (?, ?, ?, ?)", measurements)
+            db.executemany("INSERT OR IGNORE INTO languages VALUES (?, ?, ?, ?)", languages)
+            db.executemany("INSERT OR IGNORE INTO tree_languages VALUES (?, ?, ?, ?)", tree_languages)
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('last_updated', ?)", (history["last_updated"],))
 
 
 def discover_repos(base_path: Path) -> list:
     """Find all git repositories in the base path."""
-    repos = []
-    for item in base_path.iterdir():
-        if item.is_dir() and (item / ".git").exists():
-            repos.append(item)
+    # scandir entries carry their file type, saving a stat per entry over iterdir + is_dir.
+    # `.git` is checked with exists() so submodule-style .git files still count.
+    with os.scandir(base_path) as entries:
+        repos = [
+            Path(entry.path) for entry in entries
+            if entry.is_dir() and os.path.exists(os.path.join(entry.path, ".git"))
+        ]
     return sorted(repos, key=lambda x: x.name.lower())
 
 
@@ -160,68 +400,131 @@ def accumulate_loc_history(base_path: Path, start_date: datetime, end_date: date
     print(f"📊 Accumulating LOC history from {start_date.date()} to {end_date.date()}")
     print(f"   Found {len(repos)} repositories")
 
-    # Generate list of dates to measure (daily snapshots)
+    # Generate list of (date, date_str) to measure; already ascending and unique (daily snapshots)
     dates = []
     current = start_date
     while current <= end_date:
-        dates.append(current)
+        dates.append((current, current.strftime("%Y-%m-%d")))
         current += timedelta(days=1)  # Daily snapshots
-    dates = sorted(set(dates))
 
     print(f"   Will measure {len(dates)} snapshots per repo")
-
-    # Create a temporary directory for clones (avoids touching original repos)
-    temp_base = Path(tempfile.mkdtemp(prefix="loc_history_"))
-    print(f"   Using temp directory: {temp_base}")
-
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    # Create a temporary directory for snapshots (avoids touching original repos)
+    temp_base = make_temp_base()
+    print(f"   Using temp directory: {temp_base} ({MAX_WORKERS} workers)")
+
+    # Today's snapshot is HEAD, which for a clean repo is already on disk: measure all of
+    # those in place (tokei is read-only) with a single tokei run across repos. Repos whose
+    # HEAD tree is already in the by_tree cache need no tokei run at all.
+    today_strs = [date_str for date, date_str in dates if date >= today]
+    heads = {}
+    in_place_repos = []
+    for repo_path in repos:
+        repo_history = history["repos"].get(repo_path.name, {})
+        measurements = repo_history.get("measurements", {})
+        if all(d in measurements for d in today_strs) or not is_worktree_clean(repo_path):
+            continue
+        heads[repo_path] = head = get_head(repo_path)
+        if head[1] and head[1] not in repo_history.get("by_tree", {}):
+            in_place_repos.append(repo_path)
+    in_place = run_tokei_many(in_place_repos)
+
+    unsaved = 0
     try:
-        for repo_path in repos:
-            repo_name = repo_path.name
-            print(f"\n📁 {repo_name}")
-
-            if repo_name not in history["repos"]:
-                history["repos"][repo_name] = {"measurements": {}}
-
-            repo_history = history["repos"][repo_name]
-            repo_created = get_repo_created_date(repo_path)
-
-            for date in dates:
-                date_str = date.strftime("%Y-%m-%d")
-
-                # Skip if we already have this measurement
-                if date_str in repo_history["measurements"]:
-                    print(f"   {date_str}: cached")
-                    continue
-
-                # Skip if date is before repo was created
-                if date < repo_created:
-                    print(f"   {date_str}: repo not yet created")
-                    repo_history["measurements"][date_str] = {"total": 0, "languages": {}}
-                    continue
-
-                # Get commit at this date (from original repo)
-                commit = get_commit_at_date(repo_path, date)
-                if not commit:
-                    print(f"   {date_str}: no commits yet")
-                    repo_history["measurements"][date_str] = {"total": 0, "languages": {}}
-                    continue
-
-                # Measure LOC at this commit (using temp clone)
-                loc = measure_loc_at_commit(repo_path, commit, temp_base)
-                total = sum(loc.values())
-
-                repo_history["measurements"][date_str] = {
-                    "total": total,
-                    "languages": loc,
-                    "commit": commit[:8]
-                }
-
-                print(f"   {date_str}: {total:,} lines ({commit[:8]})")
-
-            # Save after each repo (in case of interruption)
-            save_history(history, history_file)
+        with ProcessPoolExecutor(max_workers=MAX_WORKERS, initializer=init_worker,
+                                 initargs=(temp_base,)) as executor:
+            for repo_path in repos:
+                repo_name = repo_path.name
+                print(f"\n📁 {repo_name}")
+
+                if repo_name not in history["repos"]:
+                    history["repos"][repo_name] = {"measurements": {}}
+
+                repo_history = history["repos"][repo_name]
+                # LOC per tree hash: days whose commits share identical content are measured once
+                tree_cache = repo_history.setdefault("by_tree", {})
+                repo_created = get_repo_created_date(repo_path)
+
+                # Resolved lazily: a today-only update never needs the history scan
+                head = heads.get(repo_path)
+                commits = None
+
+                # Dates before the repo was created are all empty: fill that span in one go
+                cutoff = bisect_left(dates, (repo_created,))
+                not_created = [d for _, d in dates[:cutoff] if d not in repo_history["measurements"]]
+                if not_created:
+                    print(f"   {not_created[0]} to {not_created[-1]}: repo not yet created")
+                    repo_history["measurements"].update(dict.fromkeys(not_created, EMPTY_MEASUREMENT))
+
+                pending = []
+                for date, date_str in dates[cutoff:]:
+                    # Skip if we already have this measurement
+                    if date_str in repo_history["measurements"]:
+                        print(f"   {date_str}: cached")
+                        continue
+
+                    # Get commit at this date (from original repo's history)
+                    if date >= today:
+                        if head is None:
+                            head = get_head(repo_path)
+                        commit, tree = head
+                    else:
+                        if commits is None:
+                            # One git log per repo; each date's commit is then found by bisection
+                            commits = list_commits(repo_path)
+                            commit_times = [entry[0] for entry in commits]
+                        commit, tree = get_commit_at_date(commits, commit_times, date)
+                    if not commit:
+                        print(f"   {date_str}: no commits yet")
+                        repo_history["measurements"][date_str] = EMPTY_MEASUREMENT
+                        continue
+
+                    pending.append((date_str, commit, tree))
+
+                # Measure uncached trees in parallel (each worker uses its own snapshot dir)
+                to_measure = list(dict.fromkeys(t for _, _, t in pending if t not in tree_cache))
+                # Verify the trees through one cat-file process so a bad hash never reaches git archive
+                if to_measure:
+                    with GitBatch(repo_path) as batch:
+                        found = {tree: batch.query(tree) for tree in to_measure}
+                    to_measure = [tree for tree in to_measure if found[tree] and found[tree][1] == "tree"]
+
+                measured = {}
+                if head and head[1] in to_measure and repo_path in in_place:
+                    to_measure.remove(head[1])
+                    measured[head[1]] = in_place[repo_path]
+
+                measured.update(executor.map(measure_one, [repo_path] * len(to_measure), to_measure))
+                # Empty results may be a transient tokei failure, so only persist real counts
+                tree_cache.update((tree, loc) for tree, loc in measured.items() if loc)
+
+                for date_str, commit, tree in pending:
+                    loc = tree_cache.get(tree) or measured.get(tree, {})
+                    if loc is None:
+                        # Export failed: leave the date unrecorded so the next run retries it
+                        print(f"   {date_str}: couldn't export {commit[:8]}, skipped")
+                        continue
+                    total = sum(loc.values())
+
+                    repo_history["measurements"][date_str] = {
+                        "total": total,
+                        "languages": dict(loc),
+                        "commit": commit[:8]
+                    }
+
+                    print(f"   {date_str}: {total:,} lines ({commit[:8]})")
+
+                # Save every few repos (and on exit) in case of interruption
+                unsaved += 1
+                if unsaved >= SAVE_EVERY:
+                    save_history(history, history_file)
+                    unsaved = 0
 
     finally:
+        if unsaved:
+            save_history(history, history_file)
+
         # Clean up temp directory
         print(f"\n🧹 Cleaning up temp directory...")
         shutil.rmtree(temp_base, ignore_errors=True)
@@ -236,7 +539,9 @@ def main():
     parser.add_argument("--days", type=int, default=1, help="Number of days to backfill (default: 1)")
     parser.add_argument("--start", help="Start date (YYYY-MM-DD)")
     parser.add_argument("--end", help="End date (YYYY-MM-DD)")
-    parser.add_argument("--output", default=LOC_HISTORY_FILE, help="Output file for LOC history")
+    parser.add_argument("--output", default=LOC_HISTORY_FILE,
+                        help="Output file for LOC history (.sqlite/.db for a SQLite store)")
+    parser.add_argument("--export-json", help="Also write the history as JSON (for the dashboard when --output is SQLite)")
 
     args = parser.parse_args()
 
@@ -257,7 +562,10 @@ def main():
 
     history_file = Path(args.output)
 
-    accumulate_loc_history(base_path, start_date, end_date, history_file)
+    history = accumulate_loc_history(base_path, start_date, end_date, history_file)
+    if args.export_json:
+        save_history(history, Path(args.export_json))
+        print(f"   Exported JSON to {args.export_json}")
     return 0
 
 
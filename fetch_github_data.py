@@ -5,7 +5,7 @@ BridgeDev Dashboard Data Fetcher
 Fetches repository data from GitHub or local git clones and generates JSON for the dashboard.
 
 Requirements:
-    pip install requests python-dateutil
+    pip install requests
 
 Optional (for lines of code counting):
     - Install 'scc': https://github.com/boyter/scc
@@ -30,15 +30,32 @@ Usage:
 """
 
 import argparse
+import hashlib
+import heapq
 import json
 import os
+import re
 import subprocess
 import sys
-from datetime import datetime, timedelta, timezone
+import tempfile
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
-import requests
-from dateutil import parser as date_parser
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+if TYPE_CHECKING:
+    import requests  # Imported lazily by GitHubFetcher; --local runs never need it
+
+try:
+    import orjson  # Optional: faster parsing of LOC tool output and dashboard writes
+except ImportError:
+    orjson = None
 
 
 # Configuration
@@ -46,23 +63,64 @@ CONFIG = {
     "output_file": "dashboard_data.json",
     "clone_dir": ".repos_cache",  # Where to clone repos for LOC counting
     "github_api": "https://api.github.com",
+    "api_concurrency": 5,  # Max simultaneous GitHub API requests
+    "api_timeout": 30,  # Seconds per GitHub API request
+    "api_cache_dir": ".repos_cache/api_cache",  # Response bodies + etags.json for conditional requests
+    "api_cache_max_age_days": 7,  # Drop cached responses not requested for this long
     "loc_tool": "tokei",  # Options: 'scc', 'tokei', 'cloc', or None to skip
+    # Vendored/generated directories tokei shouldn't even walk (keep in sync with accumulate_loc_history.py)
+    "tokei_excludes": ["node_modules", "vendor", ".venv", "dist", "build", "target"],
+    "commit_graph_sentinel": "bridgedev-graph-written",  # In .git; HEAD the commit-graph was written at
+    "scan_cache_dir": ".repos_cache/scan_cache",  # LOC/numstat results keyed by HEAD commit
 }
 
 
+# git log --shortstat: " 3 files changed, 10 insertions(+), 2 deletions(-)" (either count may be absent)
+_SHORTSTAT_RE = re.compile(rb"changed(?:, (\d+) insertions?\(\+\))?(?:, (\d+) deletions?\(-\))?")
+_SSH_RE = re.compile(r"git@[^:]+:([^/]+)/")
+_HTTPS_RE = re.compile(r"github\.com/([^/]+)/")
+_UNSET = object()  # Marks a setting absent from projects_config.json
+SKIPPED_LANGUAGES = ("Total", "HTML", "SVG", "JSON")  # Not counted as code (keep in sync with accumulate_loc_history.py)
+
+
 class GitHubFetcher:
     def __init__(self, token: Optional[str] = None):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
         self.token = token or os.environ.get("GITHUB_TOKEN")
         self.session = requests.Session()
+        # Keep-alive pool sized for the concurrent workers, with backoff on transient server errors
+        retries = Retry(total=3, backoff_factor=1, status_forcelist=(500, 502, 503, 504),
+                        allowed_methods=frozenset({"GET"}))
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=CONFIG["api_concurrency"], max_retries=retries))
         if self.token:
             self.session.headers["Authorization"] = f"token {self.token}"
         self.session.headers["Accept"] = "application/vnd.github.v3+json"
         self.session.headers["User-Agent"] = "BridgeDev-Dashboard"
+        # Caps in-flight requests across threads (GitHub's secondary rate limits punish bursts)
+        self._slots = threading.BoundedSemaphore(CONFIG["api_concurrency"])
+        # ETags of cached responses, for conditional requests (a 304 doesn't count against the rate limit):
+        # {request key: [etag, time last used]}
+        self._cache_dir = Path(CONFIG["api_cache_dir"])
+        self._etags_lock = threading.Lock()
+        try:
+            with open(self._cache_dir / "etags.json") as f:
+                self._etags = {key: entry for key, entry in json.load(f).items() if isinstance(entry, list)}
+        except (OSError, json.JSONDecodeError, AttributeError):
+            self._etags = {}
     
-    def _get(self, endpoint: str, params: dict = None) -> dict:
-        """Make a GET request to the GitHub API."""
+    def _request(self, endpoint: str, params: dict = None, headers: dict = None) -> "requests.Response":
+        """Make a GET request to the GitHub API and return the raw response."""
         url = f"{CONFIG['github_api']}{endpoint}"
-        response = self.session.get(url, params=params)
+        with self._slots:
+            response = self.session.get(url, params=params, headers=headers, timeout=CONFIG["api_timeout"])
+            retry_after = response.headers.get("Retry-After")
+            if response.status_code in (403, 429) and retry_after:
+                # Secondary rate limit: GitHub says how long to back off, so wait and retry once
+                time.sleep(int(retry_after))
+                response = self.session.get(url, params=params, headers=headers, timeout=CONFIG["api_timeout"])
         
         if response.status_code == 403:
             reset_time = response.headers.get('X-RateLimit-Reset')
@@ -72,7 +130,47 @@ class GitHubFetcher:
             raise Exception(f"GitHub API rate limit exceeded")
         
         response.raise_for_status()
+        return response
+
+    def _get(self, endpoint: str, params: dict = None) -> dict:
+        """Make a GET request to the GitHub API, revalidating any cached response by its ETag."""
+        key = f"{endpoint}?{urlencode(sorted(params.items()))}" if params else endpoint
+        body_file = self._api_cache_file(key)
+        etag = self._etags.get(key, [None])[0]
+        headers = {"If-None-Match": etag} if etag and body_file.exists() else None
+
+        response = self._request(endpoint, params, headers)
+        if response.status_code == 304:
+            with self._etags_lock:
+                self._etags[key] = [etag, time.time()]
+            raw = body_file.read_bytes()
+            return orjson.loads(raw) if orjson else json.loads(raw)
+
+        # Only complete responses are cached (stats endpoints answer 202 while computing)
+        etag = response.headers.get("ETag")
+        if response.status_code == 200 and etag:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = body_file.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_file.write_bytes(response.content)
+            os.replace(tmp_file, body_file)
+            with self._etags_lock:
+                self._etags[key] = [etag, time.time()]
         return response.json()
+
+    def _api_cache_file(self, key: str) -> Path:
+        """Where the cached response body for a request key is stored."""
+        return self._cache_dir / f"{hashlib.sha1(key.encode()).hexdigest()}.json"
+
+    def save_etags(self):
+        """Persist the ETags of cached responses for the next run, pruning long-unused entries."""
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        cutoff = time.time() - CONFIG["api_cache_max_age_days"] * 86400
+        with self._etags_lock:
+            for key in [key for key, (_, last_used) in self._etags.items() if last_used < cutoff]:
+                del self._etags[key]
+                self._api_cache_file(key).unlink(missing_ok=True)
+            with open(self._cache_dir / "etags.json", "w") as f:
+                json.dump(self._etags, f, indent=2)
     
     def _get_paginated(self, endpoint: str, params: dict = None, max_pages: int = 10) -> list:
         """Get paginated results from GitHub API."""
@@ -110,9 +208,22 @@ class GitHubFetcher:
         """Get commits for a repository."""
         params = {}
         if since:
-            params["since"] = since.isoformat()
+            # Whole days only: a to-the-microsecond cutoff would make every run a new (uncacheable) query
+            params["since"] = since.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
         return self._get_paginated(f"/repos/{owner}/{repo}/commits", params)
     
+    def get_total_commit_count(self, owner: str, repo: str) -> int:
+        """Get the total number of commits in one request.
+
+        With per_page=1 every page holds one commit, so the page number of the
+        rel="last" link is the commit count.
+        """
+        response = self._request(f"/repos/{owner}/{repo}/commits", {"per_page": 1})
+        last_url = response.links.get("last", {}).get("url")
+        if last_url:
+            return int(parse_qs(urlparse(last_url).query)["page"][0])
+        return len(response.json())  # Only one page: 0 or 1 commits
+
     def get_commit_activity(self, owner: str, repo: str) -> list:
         """Get weekly commit activity for the last year."""
         try:
@@ -131,28 +242,46 @@ class GitHubFetcher:
 class LocalRepoScanner:
     """Scan local git repositories for dashboard data without API calls."""
 
-    def __init__(self, base_path: str, author: str = None):
+    def __init__(self, base_path: str, author: str = None, remote_urls: dict = None):
         self.base_path = Path(base_path)
         self.author = author
+        self._numstat_cache = {}  # repo_path -> (since, per-commit numstat)
+        # repo_path -> origin URL ("" if none); callers may pass in URLs they already looked up
+        self._remote_urls = dict(remote_urls or {})
 
     def discover_repos(self) -> list:
-        """Find all git repositories in the base path."""
+        """Find all git repositories in the base path (and look up each one's origin URL)."""
         repos = []
         for item in self.base_path.iterdir():
             if item.is_dir() and (item / ".git").exists():
                 repos.append(item)
+                self.get_remote_url(item)
         return sorted(repos, key=lambda x: x.name.lower())
 
+    def get_remote_url(self, repo_path: Path) -> str:
+        """Get the origin remote URL ("" if there is none), looked up once per repo."""
+        if repo_path not in self._remote_urls:
+            remote_url = self._run_git(repo_path, ["remote", "get-url", "origin"])
+            self._remote_urls[repo_path] = remote_url.strip() if remote_url else ""
+        return self._remote_urls[repo_path]
+
+    def get_owner(self, repo_path: Path) -> str:
+        """Get the repository owner from its origin URL ("local" if there is none)."""
+        remote_url = self.get_remote_url(repo_path)
+        return self._parse_owner_from_url(remote_url) if remote_url else "local"
+
     def get_repo_info(self, repo_path: Path) -> dict:
         """Extract basic info from a local repository."""
         name = repo_path.name
 
-        # Get remote URL to extract owner
-        remote_url = self._run_git(repo_path, ["remote", "get-url", "origin"])
-        owner = self._parse_owner_from_url(remote_url) if remote_url else "local"
+        remote_url = self.get_remote_url(repo_path)
+        owner = self.get_owner(repo_path)
 
-        # Get first commit date (created_at)
-        first_commit = self._run_git(repo_path, ["log", "--reverse", "--format=%aI", "--max-count=1"])
+        # Get first commit date (created_at) from the root commit(s); the last listed is the oldest.
+        # (`log --reverse --max-count=1` would give HEAD: the limit applies before reversing.)
+        first_commit = self._run_git(repo_path, ["log", "--max-parents=0", "--format=%aI"])
+        if first_commit and first_commit.strip():
+            first_commit = first_commit.splitlines()[-1]
 
         # Get last commit date
         last_commit = self._run_git(repo_path, ["log", "-1", "--format=%aI"])
@@ -168,77 +297,43 @@ class LocalRepoScanner:
             "created_at": first_commit.strip() if first_commit else "",
             "updated_at": last_commit.strip() if last_commit else "",
             "pushed_at": last_commit.strip() if last_commit else "",
-            "html_url": remote_url.strip().replace(".git", "") if remote_url else "",
+            "html_url": remote_url.replace(".git", ""),
         }
 
     def get_commit_count(self, repo_path: Path) -> int:
         """Get total number of commits."""
+        # git counts natively, even with an author filter (no need to stream every subject line)
         cmd = ["rev-list", "--count", "HEAD"]
         if self.author:
-            cmd = ["log", "--oneline"]
             cmd.append(f"--author={self.author}")
-            result = self._run_git(repo_path, cmd)
-            return len(result.strip().split("\n")) if result and result.strip() else 0
         result = self._run_git(repo_path, cmd)
         return int(result.strip()) if result else 0
 
-    def get_commits_since(self, repo_path: Path, since: datetime) -> list:
-        """Get commits since a given date."""
+    def get_daily_commit_counts(self, repo_path: Path, since: datetime) -> Counter:
+        """Get the number of commits per author date (YYYY-MM-DD) since a given date."""
         since_str = since.strftime("%Y-%m-%d")
-        cmd = ["log", f"--since={since_str}", "--format=%H|%aI|%s"]
+        cmd = ["log", f"--since={since_str}", "--format=%as"]
         if self.author:
             cmd.append(f"--author={self.author}")
-        result = self._run_git(repo_path, cmd)
-        if not result:
-            return []
-
-        commits = []
-        for line in result.strip().split("\n"):
-            if line and "|" in line:
-                parts = line.split("|", 2)
-                if len(parts) >= 2:
-                    commits.append({
-                        "sha": parts[0],
-                        "commit": {
-                            "author": {"date": parts[1]},
-                            "message": parts[2] if len(parts) > 2 else ""
-                        }
-                    })
-        return commits
+        return Counter(line for line in self._iter_git_lines(repo_path, cmd) if line)
 
     def get_code_frequency(self, repo_path: Path, weeks: int = 12) -> list:
         """Get weekly additions/deletions for the last N weeks."""
         result = []
         today = datetime.now()
+        numstat = self._collect_numstat(repo_path, today - timedelta(days=weeks * 7))
 
         for i in range(weeks - 1, -1, -1):
             week_start = today - timedelta(days=(i + 1) * 7)
             week_end = today - timedelta(days=i * 7)
-
-            cmd = [
-                "log",
-                f"--since={week_start.strftime('%Y-%m-%d')}",
-                f"--until={week_end.strftime('%Y-%m-%d')}",
-                "--numstat",
-                "--format="
-            ]
-            if self.author:
-                cmd.append(f"--author={self.author}")
-            stats = self._run_git(repo_path, cmd)
+            start_ts, end_ts = week_start.timestamp(), week_end.timestamp()
 
             additions = 0
             deletions = 0
-            if stats:
-                for line in stats.strip().split("\n"):
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        try:
-                            if parts[0] != "-":
-                                additions += int(parts[0])
-                            if parts[1] != "-":
-                                deletions += int(parts[1])
-                        except ValueError:
-                            pass
+            for timestamp, adds, dels in numstat:
+                if start_ts <= timestamp < end_ts:
+                    additions += adds
+                    deletions += dels
 
             result.append([
                 int(week_start.timestamp()),
@@ -250,52 +345,24 @@ class LocalRepoScanner:
 
     def get_monthly_loc_changes(self, repo_path: Path, months: int = 12) -> list:
         """Get monthly additions/deletions for LOC history using actual calendar months."""
-        from calendar import monthrange
-        result = []
-        today = datetime.now()
-
-        # Generate list of months going back
-        for i in range(months - 1, -1, -1):
-            # Calculate the target month
-            year = today.year
-            month = today.month - i
-            while month <= 0:
-                month += 12
-                year -= 1
-
-            # First and last day of the month
-            first_day = datetime(year, month, 1)
-            last_day_num = monthrange(year, month)[1]
-            last_day = datetime(year, month, last_day_num, 23, 59, 59)
-
-            cmd = [
-                "log",
-                f"--since={first_day.strftime('%Y-%m-%d')}",
-                f"--until={last_day.strftime('%Y-%m-%d')}",
-                "--numstat",
-                "--format="
-            ]
-            if self.author:
-                cmd.append(f"--author={self.author}")
-            stats = self._run_git(repo_path, cmd)
-
-            additions = 0
-            deletions = 0
-            if stats:
-                for line in stats.strip().split("\n"):
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        try:
-                            if parts[0] != "-":
-                                additions += int(parts[0])
-                            if parts[1] != "-":
-                                deletions += int(parts[1])
-                        except ValueError:
-                            pass
+        month_table = _recent_months(datetime.now().date(), months)
+        numstat = self._collect_numstat(repo_path, month_table[0][0])
+
+        # Month boundaries as timestamps: commit i falls in month bisect_right(bounds, ts) - 1
+        bounds = [first_day.timestamp() for first_day, _, _, _ in month_table]
+        bounds.append(month_table[-1][1].timestamp())
+        totals = [[0, 0] for _ in month_table]
+        for timestamp, adds, dels in numstat:
+            idx = bisect_right(bounds, timestamp) - 1
+            if 0 <= idx < months:
+                totals[idx][0] += adds
+                totals[idx][1] += dels
 
+        result = []
+        for (_, _, label, label_short), (additions, deletions) in zip(month_table, totals):
             result.append({
-                "month": first_day.strftime("%b %Y"),
-                "month_short": first_day.strftime("%b"),
+                "month": label,
+                "month_short": label_short,
                 "additions": additions,
                 "deletions": deletions,
                 "net": additions - deletions
@@ -303,6 +370,49 @@ class LocalRepoScanner:
 
         return result
 
+    def _collect_numstat(self, repo_path: Path, since: datetime) -> list:
+        """Get (commit timestamp, additions, deletions) per commit since a date, from one git log.
+
+        Memoized per repo, so the weekly and monthly views share a single history walk
+        as long as the first call covers the longer window.
+        """
+        cached = self._numstat_cache.get(repo_path)
+        if cached and cached[0] <= since:
+            return cached[1]
+
+        # History below a commit never changes, so results are also cached on disk by HEAD
+        head = self._run_git(repo_path, ["rev-parse", "HEAD"])
+        cache_key = scan_cache_key("numstat", head.strip(), self.author or "") if head else None
+        cached = load_scan_cache(cache_key) if cache_key else None
+        if cached and cached["since"] <= since.timestamp():
+            self._numstat_cache[repo_path] = (since, cached["commits"])
+            return cached["commits"]
+
+        cmd = [
+            "log",
+            f"--since={since.strftime('%Y-%m-%d %H:%M:%S')}",
+            "--shortstat",  # git sums each commit's file rows itself: one line per commit to parse
+            "--format=%x00%ct"
+        ]
+        if self.author:
+            cmd.append(f"--author={self.author}")
+        commits = []
+        # The output is all ASCII (timestamps and stat lines), so parse it as bytes without decoding
+        for line in self._iter_git_lines(repo_path, cmd, binary=True):
+            if line.startswith(b"\0"):
+                commits.append([int(line[1:]), 0, 0])
+                continue
+            match = _SHORTSTAT_RE.search(line)
+            if match and commits:
+                added, deleted = match.groups()
+                commits[-1][1] = int(added or 0)
+                commits[-1][2] = int(deleted or 0)
+
+        self._numstat_cache[repo_path] = (since, commits)
+        if cache_key:
+            save_scan_cache(cache_key, {"since": since.timestamp(), "commits": commits})
+        return commits
+
     def get_releases(self, repo_path: Path, limit: int = 10) -> list:
         """Get releases (git tags) with dates, sorted by date descending."""
         # Get tags with their dates using for-each-ref
@@ -319,22 +429,49 @@ class LocalRepoScanner:
 
         releases = []
         repo_name = repo_path.name
-        for line in result.strip().split("\n"):
-            if line and "|" in line:
-                parts = line.split("|", 2)
-                if len(parts) >= 2:
-                    tag = parts[0]
-                    date = parts[1]
-                    message = parts[2] if len(parts) > 2 else ""
-                    releases.append({
-                        "tag": tag,
-                        "date": date,
-                        "message": message,
-                        "repo": repo_name
-                    })
+        for line in result.splitlines():
+            tag, sep, rest = line.partition("|")
+            if sep:
+                date, _, message = rest.partition("|")
+                releases.append({
+                    "tag": tag,
+                    "date": date,
+                    "message": message,
+                    "repo": repo_name
+                })
 
         return releases
 
+    def ensure_commit_graph(self, repo_path: Path):
+        """Write a commit-graph with changed-path Bloom filters so later log walks are cheap.
+
+        Skipped when HEAD hasn't moved since the last write (tracked by a sentinel file in
+        the git dir). Failures (e.g. git older than 2.27) are ignored; the graph is only a cache.
+        """
+        result = self._run_git(repo_path, ["rev-parse", "--absolute-git-dir", "HEAD"])
+        # One value per line: the git dir path may itself contain spaces
+        lines = result.splitlines() if result else []
+        if len(lines) != 2:
+            return
+        git_dir, head = lines
+        sentinel = Path(git_dir) / CONFIG["commit_graph_sentinel"]
+        try:
+            if sentinel.read_text().strip() == head:
+                return
+        except OSError:
+            pass
+
+        try:
+            graph = subprocess.run(
+                ["git", "-C", str(repo_path), "commit-graph", "write",
+                 "--reachable", "--changed-paths", "--no-progress"],
+                capture_output=True, timeout=120
+            )
+            if graph.returncode == 0:
+                sentinel.write_text(head + "\n")
+        except (subprocess.TimeoutExpired, OSError):
+            pass
+
     def _run_git(self, repo_path: Path, args: list) -> Optional[str]:
         """Run a git command and return output."""
         try:
@@ -346,51 +483,81 @@ class LocalRepoScanner:
         except Exception:
             return None
 
-    def _parse_owner_from_url(self, url: str) -> str:
+    def _iter_git_lines(self, repo_path: Path, args: list, binary: bool = False):
+        """Run a git command and yield its output line by line, without holding it all in memory.
+
+        Lines are str, or undecoded bytes if `binary` is set.
+        """
+        try:
+            proc = subprocess.Popen(
+                ["git", "-C", str(repo_path)] + args,
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                text=not binary, errors=None if binary else "replace"
+            )
+        except OSError:
+            return
+        newline = b"\n" if binary else "\n"
+        try:
+            for line in proc.stdout:
+                yield line.rstrip(newline)
+        finally:
+            proc.stdout.close()
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _parse_owner_from_url(url: str) -> str:
         """Extract owner from git remote URL."""
         url = url.strip()
-        # Handle SSH URLs: git@github.com:owner/repo.git
-        if url.startswith("git@"):
-            match = url.split(":")[-1]
-            if "/" in match:
-                return match.split("/")[0]
-        # Handle HTTPS URLs: https://github.com/owner/repo.git
-        elif "github.com" in url:
-            parts = url.split("github.com")[-1].strip("/").split("/")
-            if parts:
-                return parts[0]
-        return "local"
+        # SSH URLs (git@github.com:owner/repo.git), then HTTPS URLs (https://github.com/owner/repo.git)
+        match = _SSH_RE.match(url) or _HTTPS_RE.search(url)
+        return match.group(1) if match else "local"
 
     def _get_description(self, repo_path: Path) -> str:
         """Try to get repository description."""
-        # Check .git/description
-        desc_file = repo_path / ".git" / "description"
-        if desc_file.exists():
-            content = desc_file.read_text().strip()
-            if content and "Unnamed repository" not in content:
-                return content
-
-        # Check README for first line
-        for readme in ["README.md", "README.rst", "README.txt", "README"]:
-            readme_path = repo_path / readme
-            if readme_path.exists():
-                try:
-                    lines = readme_path.read_text().split("\n")
-                    for line in lines[:5]:
-                        line = line.strip().lstrip("#").strip()
-                        if line and len(line) > 5:
-                            return line[:200]
-                except Exception:
-                    pass
+        return _read_description(str(repo_path))
+
+
+@lru_cache(maxsize=None)
+def _read_description(repo_dir: str) -> str:
+    """Read a description from .git/description or the README (cached per repo directory)."""
+    repo_path = Path(repo_dir)
+    # Check .git/description
+    desc_file = repo_path / ".git" / "description"
+    if desc_file.exists():
+        content = desc_file.read_text().strip()
+        if content and "Unnamed repository" not in content:
+            return content
+
+    # Check README for first line
+    for readme in ["README.md", "README.rst", "README.txt", "README"]:
+        readme_path = repo_path / readme
+        if readme_path.exists():
+            try:
+                lines = readme_path.read_text().splitlines()
+                for line in lines[:5]:
+                    line = line.strip().lstrip("#").strip()
+                    if line and len(line) > 5:
+                        return line[:200]
+            except Exception:
+                pass
 
-        return ""
+    return ""
 
 
-def fetch_local_project_data(scanner: LocalRepoScanner, repo_path: Path, skip_loc: bool = False) -> dict:
-    """Fetch all data for a single local project."""
+def fetch_local_project_data(scanner: LocalRepoScanner, repo_path: Path, skip_loc: bool = False,
+                             loc: Optional[dict] = None) -> dict:
+    """Fetch all data for a single local project (`loc` may be passed in if already counted)."""
     fork_indicator = " (fork)" if skip_loc else ""
     print(f"\n📊 Processing {repo_path.name}{fork_indicator}...")
 
+    # Precompute the commit-graph once so every git log below can use it
+    scanner.ensure_commit_graph(repo_path)
+
     # Basic repo info
     info = scanner.get_repo_info(repo_path)
 
@@ -398,32 +565,31 @@ def fetch_local_project_data(scanner: LocalRepoScanner, repo_path: Path, skip_lo
     if skip_loc:
         loc = {}
         print(f"   ⏭️  Skipping LOC count (fork)")
-    else:
+    elif loc is None:
         loc = count_lines_of_code(str(repo_path), CONFIG["loc_tool"])
 
     # Commits (last 90 days)
     since = datetime.now() - timedelta(days=90)
-    commits = scanner.get_commits_since(repo_path, since)
-    commit_history = process_commit_history(commits)
+    commit_history = build_daily_history(scanner.get_daily_commit_counts(repo_path, since))
 
     # Total commits
     total_commits = scanner.get_commit_count(repo_path)
 
+    # Monthly LOC changes for history (first: its 12-month numstat walk is reused below)
+    monthly_loc_changes = scanner.get_monthly_loc_changes(repo_path)
+
     # Code frequency (additions/deletions)
     code_freq = scanner.get_code_frequency(repo_path)
     code_changes = process_code_frequency(code_freq) if code_freq else []
 
-    # Monthly LOC changes for history
-    monthly_loc_changes = scanner.get_monthly_loc_changes(repo_path)
-
     # Get releases (tags)
     releases = scanner.get_releases(repo_path)
 
     # Determine primary language from LOC
-    primary_language = max(loc.keys(), key=lambda k: loc[k]) if loc else "Unknown"
+    primary_language = max(loc, key=loc.get) if loc else "Unknown"
 
     project = {
-        "id": hash(info["full_name"]) & 0xFFFFFFFF,  # Generate a stable ID
+        "id": int.from_bytes(hashlib.blake2b(info["full_name"].encode(), digest_size=4).digest(), "big"),  # Stable across runs
         "name": info["name"],
         "full_name": info["full_name"],
         "description": info["description"],
@@ -452,41 +618,183 @@ def fetch_local_project_data(scanner: LocalRepoScanner, repo_path: Path, skip_lo
     return project
 
 
+def scan_local_repo(task: tuple) -> Optional[dict]:
+    """Process-pool worker: fetch one local project from (base_path, author, repo_path, remote_url, skip_loc, loc).
+
+    Returns None (after reporting the error) if the repo couldn't be processed.
+    """
+    base_path, author, repo_path, remote_url, skip_loc, loc = task
+    # The origin URL was already looked up by the parent's scanner
+    scanner = LocalRepoScanner(base_path, author=author, remote_urls={repo_path: remote_url})
+    try:
+        return fetch_local_project_data(scanner, repo_path, skip_loc=skip_loc, loc=loc)
+    except Exception as e:
+        print(f"   ❌ Error processing {repo_path.name}: {e}")
+        return None
+
+
+def scan_cache_key(*parts: str) -> str:
+    """Build a scan-cache key (a file-name-safe digest) from its identifying parts."""
+    return hashlib.sha1("\0".join(parts).encode()).hexdigest()
+
+
+def load_scan_cache(key: str):
+    """Load a cached scan result, or None on a miss."""
+    try:
+        with open(Path(CONFIG["scan_cache_dir"]) / f"{key}.json") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def save_scan_cache(key: str, data):
+    """Store a scan result (via rename, so parallel workers never see a partial file)."""
+    cache_dir = Path(CONFIG["scan_cache_dir"])
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_dir / f"{key}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, cache_dir / f"{key}.json")
+    except OSError:
+        pass
+
+
+def loc_cache_key(repo_path: str, tool: str) -> Optional[str]:
+    """Cache key for a LOC count: HEAD plus tool settings, or None if the working tree is dirty."""
+    try:
+        result = subprocess.run(
+            ["git", "-C", repo_path, "status", "--porcelain=v2", "--branch"],
+            capture_output=True, text=True, timeout=30
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+
+    head = None
+    for line in result.stdout.splitlines():
+        if line.startswith("# branch.oid "):
+            head = line.split()[-1]
+        elif not line.startswith("#"):
+            return None  # Uncommitted or untracked changes: counts don't follow from HEAD
+    if not head or head == "(initial)":
+        return None
+    return scan_cache_key("loc", tool, head, ",".join(CONFIG["tokei_excludes"]))
+
+
+def tokei_command(paths: list, *extra_args) -> list:
+    """Build a tokei JSON-output command line with the configured excludes."""
+    excludes = [arg for pattern in CONFIG["tokei_excludes"] for arg in ("--exclude", pattern)]
+    return ["tokei", "--output", "json", *extra_args, *excludes] + [str(p) for p in paths]
+
+
 def count_lines_of_code(repo_path: str, tool: str = "scc") -> dict:
     """
     Count lines of code using scc, tokei, or cloc.
     Returns a dict of {language: lines}.
+    Results for clean working trees are cached on disk by HEAD commit.
     """
     if not tool:
         return {}
-    
+
+    cache_key = loc_cache_key(repo_path, tool)
+    cached = load_scan_cache(cache_key) if cache_key else None
+    if cached is not None:
+        return cached
+
+    loc = run_loc_tool(repo_path, tool)
+    if cache_key and loc:
+        save_scan_cache(cache_key, loc)
+    return loc
+
+
+def count_lines_of_code_many(repo_paths: list, tool: str) -> dict:
+    """
+    Count lines of code for several repos with a single tokei run.
+    Returns {repo_path: {language: lines}} for the repos it could count, using and
+    filling the same on-disk cache as count_lines_of_code. Other tools return {}
+    (callers count those repos one at a time).
+    """
+    if tool != "tokei":
+        return {}
+
+    loc_by_repo = {}
+    to_count = {}  # str(repo_path) -> (repo_path, cache key)
+    for repo_path in repo_paths:
+        cache_key = loc_cache_key(str(repo_path), tool)
+        cached = load_scan_cache(cache_key) if cache_key else None
+        if cached is not None:
+            loc_by_repo[repo_path] = cached
+        else:
+            to_count[str(repo_path)] = (repo_path, cache_key)
+    if not to_count:
+        return loc_by_repo
+
+    # One invocation lets tokei's thread pool cover every repo; per-file reports are mapped back to repos
+    try:
+        result = subprocess.run(
+            tokei_command(to_count, "--files"),
+            capture_output=True, timeout=600
+        )
+        if result.returncode != 0:
+            return loc_by_repo
+        data = orjson.loads(result.stdout) if orjson else json.loads(result.stdout)
+    except (FileNotFoundError, subprocess.TimeoutExpired, json.JSONDecodeError):
+        return loc_by_repo
+
+    counted = {repo_path: {} for repo_path, _ in to_count.values()}
+    for lang, info in data.items():
+        if lang in SKIPPED_LANGUAGES or not isinstance(info, dict):
+            continue
+        for report in info.get("reports", []):
+            code = report.get("stats", {}).get("code", 0)
+            if not code:
+                continue
+            for parent in Path(report["name"]).parents:
+                if str(parent) in to_count:
+                    loc = counted[to_count[str(parent)][0]]
+                    loc[lang] = loc.get(lang, 0) + code
+                    break
+
+    for repo_path, cache_key in to_count.values():
+        loc = counted[repo_path]
+        if cache_key and loc:
+            save_scan_cache(cache_key, loc)
+        loc_by_repo[repo_path] = loc
+    return loc_by_repo
+
+
+def run_loc_tool(repo_path: str, tool: str) -> dict:
+    """Run scc, tokei, or cloc on a directory and return {language: lines}."""
     try:
         if tool == "scc":
             result = subprocess.run(
                 ["scc", "--format", "json", repo_path],
-                capture_output=True, text=True, timeout=120
+                capture_output=True, timeout=120
             )
             if result.returncode == 0:
-                data = json.loads(result.stdout)
+                # Both parsers accept raw bytes, which skips a decode pass over the output
+                data = orjson.loads(result.stdout) if orjson else json.loads(result.stdout)
                 return {item["Name"]: item["Code"] for item in data if item.get("Code", 0) > 0}
         
         elif tool == "tokei":
             result = subprocess.run(
-                ["tokei", "--output", "json", repo_path],
-                capture_output=True, text=True, timeout=120
+                tokei_command([repo_path]),
+                capture_output=True, timeout=120
             )
             if result.returncode == 0:
-                data = json.loads(result.stdout)
+                data = orjson.loads(result.stdout) if orjson else json.loads(result.stdout)
                 return {lang: info.get("code", 0) for lang, info in data.items()
-                        if lang not in ("Total", "HTML", "SVG", "JSON") and isinstance(info, dict) and info.get("code", 0) > 0}
+                        if lang not in SKIPPED_LANGUAGES and isinstance(info, dict) and info.get("code", 0) > 0}
         
         elif tool == "cloc":
             result = subprocess.run(
                 ["cloc", "--json", repo_path],
-                capture_output=True, text=True, timeout=120
+                capture_output=True, timeout=120
             )
             if result.returncode == 0:
-                data = json.loads(result.stdout)
+                data = orjson.loads(result.stdout) if orjson else json.loads(result.stdout)
                 return {lang: info.get("code", 0) for lang, info in data.items()
                         if lang not in ("header", "SUM", "SVG") and isinstance(info, dict)}
     
@@ -516,8 +824,20 @@ def clone_or_update_repo(owner: str, repo: str, clone_dir: str) -> Optional[str]
             )
         else:
             print(f"   📥 Cloning {owner}/{repo}...")
+            # Only LOC is counted here: skip large blobs (binaries, assets) and don't check out
+            # the directories tokei excludes anyway
+            subprocess.run(
+                ["git", "clone", "--depth", "1", "--filter=blob:limit=1m", "--no-checkout", "--quiet",
+                 clone_url, str(repo_path)],
+                capture_output=True, timeout=120
+            )
+            subprocess.run(
+                ["git", "-C", str(repo_path), "sparse-checkout", "set", "--no-cone", "/*"]
+                + [f"!{pattern}/" for pattern in CONFIG["tokei_excludes"]],
+                capture_output=True, timeout=30
+            )
             subprocess.run(
-                ["git", "clone", "--depth", "1", "--quiet", clone_url, str(repo_path)],
+                ["git", "-C", str(repo_path), "checkout", "--quiet"],
                 capture_output=True, timeout=120
             )
         return str(repo_path)
@@ -558,27 +878,38 @@ def estimate_loc_from_languages(languages: dict) -> dict:
 
 def process_commit_history(commits: list, days: int = 90) -> list:
     """Process commits into daily activity data."""
-    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    # ISO-8601 (GitHub API) dates start with YYYY-MM-DD
+    counts = Counter(
+        commit.get("commit", {}).get("author", {}).get("date", "")[:10]
+        for commit in commits
+    )
+    return build_daily_history(counts, days)
+
+
+def build_daily_history(counts: Counter, days: int = 90) -> list:
+    """Build daily activity data for the last `days` days from {YYYY-MM-DD: commits}."""
+    return [{"date": d, "commits": counts.get(d, 0), "additions": 0, "deletions": 0}
+            for d in _recent_days(datetime.now().date(), days)]
+
+
+@lru_cache(maxsize=None)
+def _recent_days(today: date, days: int) -> tuple:
+    """YYYY-MM-DD labels for the `days` days before today (oldest first), computed once per day."""
     start_date = today - timedelta(days=days)
-    
-    # Initialize all days
-    daily_commits = {}
-    for i in range(days):
-        date = (start_date + timedelta(days=i)).strftime("%Y-%m-%d")
-        daily_commits[date] = {"date": date, "commits": 0, "additions": 0, "deletions": 0}
-    
-    # Count commits per day
-    for commit in commits:
-        try:
-            commit_date = commit.get("commit", {}).get("author", {}).get("date", "")
-            if commit_date:
-                dt = date_parser.parse(commit_date).strftime("%Y-%m-%d")
-                if dt in daily_commits:
-                    daily_commits[dt]["commits"] += 1
-        except:
-            pass
-    
-    return list(daily_commits.values())
+    return tuple((start_date + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days))
+
+
+@lru_cache(maxsize=None)
+def _recent_months(today: date, months: int = 12) -> tuple:
+    """(first day, first day of next month, "Jan 2025", "Jan") for the last `months` calendar
+    months up to and including today's, oldest first. Computed once per day."""
+    table = []
+    for i in range(months - 1, -1, -1):
+        year, month = divmod(today.year * 12 + today.month - 1 - i, 12)
+        first_day = datetime(year, month + 1, 1)
+        next_first_day = (first_day + timedelta(days=32)).replace(day=1)
+        table.append((first_day, next_first_day, first_day.strftime("%b %Y"), first_day.strftime("%b")))
+    return tuple(table)
 
 
 def process_code_frequency(code_freq: list) -> list:
@@ -597,11 +928,20 @@ def fetch_project_data(fetcher: GitHubFetcher, owner: str, repo: str,
     """Fetch all data for a single project."""
     print(f"\n📊 Processing {owner}/{repo}...")
     
+    # The API calls are independent, so issue them concurrently (the fetcher caps in-flight requests)
+    since = datetime.now() - timedelta(days=90)
+    with ThreadPoolExecutor(max_workers=CONFIG["api_concurrency"]) as pool:
+        info_future = pool.submit(fetcher.get_repo_info, owner, repo)
+        languages_future = pool.submit(fetcher.get_repo_languages, owner, repo)
+        commits_future = pool.submit(fetcher.get_repo_commits, owner, repo, since)
+        code_freq_future = pool.submit(fetcher.get_code_frequency, owner, repo)
+        total_commits_future = pool.submit(fetcher.get_total_commit_count, owner, repo)
+
     # Basic repo info
-    info = fetcher.get_repo_info(owner, repo)
+    info = info_future.result()
     
     # Languages
-    languages_bytes = fetcher.get_repo_languages(owner, repo)
+    languages_bytes = languages_future.result()
     
     # Get LOC - either by cloning or estimating
     if clone_for_loc and CONFIG["loc_tool"]:
@@ -614,19 +954,18 @@ def fetch_project_data(fetcher: GitHubFetcher, owner: str, repo: str,
         loc = estimate_loc_from_languages(languages_bytes)
     
     # Commits (last 90 days)
-    since = datetime.now() - timedelta(days=90)
-    commits = fetcher.get_repo_commits(owner, repo, since)
+    commits = commits_future.result()
     commit_history = process_commit_history(commits)
     
     # Code frequency (additions/deletions)
-    code_freq = fetcher.get_code_frequency(owner, repo)
+    code_freq = code_freq_future.result()
     code_changes = process_code_frequency(code_freq) if code_freq else []
     
     # Determine primary language
-    primary_language = info.get("language") or (max(loc.keys(), key=lambda k: loc[k]) if loc else "Unknown")
+    primary_language = info.get("language") or (max(loc, key=loc.get) if loc else "Unknown")
     
     # Calculate total commits
-    total_commits = len(fetcher.get_repo_commits(owner, repo))
+    total_commits = total_commits_future.result()
     
     project = {
         "id": info["id"],
@@ -666,10 +1005,16 @@ def calculate_progress(project: dict) -> int:
     # - Open issues (fewer = more complete)
     # - Code size (larger codebase may indicate maturity)
     
-    recent_commits = project.get("recent_commits", 0)
-    open_issues = project.get("open_issues", 0)
-    total_loc = sum(project.get("loc", {}).values())
-    
+    return _progress_score(
+        sum(project.get("loc", {}).values()),
+        project.get("recent_commits", 0),
+        project.get("open_issues", 0),
+    )
+
+
+@lru_cache(maxsize=None)
+def _progress_score(total_loc: int, recent_commits: int, open_issues: int) -> int:
+    """Progress heuristic on its three inputs (memoized: many projects share the same buckets)."""
     # Base progress from code size (max 40 points)
     if total_loc > 10000:
         code_score = 40
@@ -728,29 +1073,14 @@ def generate_loc_history(projects: list, loc_history_file: str = "loc_history.js
     """
     non_fork_projects = [p for p in projects if not p.get("is_fork", False)]
     total_loc = sum(sum(p.get("loc", {}).values()) for p in non_fork_projects)
-    today = datetime.now()
-
-    # Build month labels for the last 12 calendar months
-    months_data = []
-    for i in range(11, -1, -1):
-        year = today.year
-        month = today.month - i
-        while month <= 0:
-            month += 12
-            year -= 1
-        months_data.append({
-            "month": datetime(year, month, 1).strftime("%b"),
-            "year": year,
-            "month_num": month,
-            "start_date": datetime(year, month, 1),
-        })
+    month_table = _recent_months(datetime.now().date())
 
     # Try to load accumulated LOC history
     loc_history = {}
     if Path(loc_history_file).exists():
         try:
-            with open(loc_history_file) as f:
-                loc_history = json.load(f).get("repos", {})
+            raw = Path(loc_history_file).read_bytes()
+            loc_history = (orjson.loads(raw) if orjson else json.loads(raw)).get("repos", {})
         except (json.JSONDecodeError, IOError):
             pass
 
@@ -764,28 +1094,20 @@ def generate_loc_history(projects: list, loc_history_file: str = "loc_history.js
         repo_measurements = loc_history.get(repo_name, {}).get("measurements", {})
 
         if repo_measurements:
-            # For each month, find the closest measurement
-            for idx, month_info in enumerate(months_data):
-                month_start = month_info["start_date"]
-                # Find measurements within this month or the closest one before
-                best_value = 0
-                best_date = None
-                for date_str, data in repo_measurements.items():
-                    try:
-                        measurement_date = datetime.strptime(date_str, "%Y-%m-%d")
-                        # Use measurements from this month or earlier
-                        if measurement_date <= month_start + timedelta(days=31):
-                            if measurement_date.year == month_start.year and measurement_date.month == month_start.month:
-                                # Exact month match - use this
-                                best_value = data.get("total", 0)
-                                best_date = measurement_date
-                            elif best_date is None or measurement_date > best_date:
-                                if measurement_date <= month_start:
-                                    best_value = data.get("total", 0)
-                                    best_date = measurement_date
-                    except ValueError:
-                        continue
-                loc_values[idx] = best_value
+            # Sort once, then binary-search each month instead of rescanning every measurement
+            parsed = []
+            for date_str, data in repo_measurements.items():
+                try:
+                    parsed.append((datetime.strptime(date_str, "%Y-%m-%d"), data.get("total", 0)))
+                except ValueError:
+                    continue
+            parsed.sort()
+            measurement_dates = [d for d, _ in parsed]
+
+            # Each month shows its latest measurement, else the latest one before it
+            for idx, (_, next_month_start, _, _) in enumerate(month_table):
+                pos = bisect_left(measurement_dates, next_month_start)
+                loc_values[idx] = parsed[pos - 1][1] if pos else 0
 
             # Ensure the final month uses current LOC
             loc_values[11] = project_loc
@@ -801,10 +1123,10 @@ def generate_loc_history(projects: list, loc_history_file: str = "loc_history.js
 
     # Build aggregated total history
     total_history = []
-    for idx, month_info in enumerate(months_data):
+    for idx, (_, _, _, label_short) in enumerate(month_table):
         month_total = sum(r["data"][idx] for r in repos_history)
         total_history.append({
-            "month": month_info["month"],
+            "month": label_short,
             "loc": month_total
         })
 
@@ -812,7 +1134,7 @@ def generate_loc_history(projects: list, loc_history_file: str = "loc_history.js
     repos_history.sort(key=lambda x: x.get("created_at", ""))
 
     return {
-        "months": [m["month"] for m in months_data],
+        "months": [label_short for _, _, _, label_short in month_table],
         "total": total_history,
         "repos": repos_history
     }
@@ -820,17 +1142,48 @@ def generate_loc_history(projects: list, loc_history_file: str = "loc_history.js
 
 def load_project_config(config_file: str = "projects_config.json") -> dict:
     """Load manual project configuration (goals, progress, etc.)."""
-    if Path(config_file).exists():
-        with open(config_file) as f:
-            return json.load(f)
-    return {}
+    try:
+        with open(config_file, "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return {}
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+
+def project_overrides(project_config: dict) -> dict:
+    """Flatten project config into {full_name: (progress, goals, completed_goals, description)}.
+
+    Settings missing from a project's config are _UNSET (description: None).
+    """
+    return {
+        full_name: (config.get("progress", _UNSET), config.get("goals", _UNSET),
+                    config.get("completed_goals", _UNSET), config.get("description"))
+        for full_name, config in project_config.items()
+    }
+
+
+def apply_project_overrides(project: dict, override: Optional[tuple]):
+    """Apply one project's (progress, goals, completed_goals, description) overrides, if any."""
+    if override is None:
+        return
+    progress, goals, completed_goals, description = override
+    if progress is not _UNSET:
+        project["progress"] = progress
+    if goals is not _UNSET:
+        project["goals"] = goals
+    if completed_goals is not _UNSET:
+        project["completed_goals"] = completed_goals
+    if description:
+        project["description"] = description
 
 
 def save_project_config_template(projects: list, config_file: str = "projects_config.json"):
     """Save a template config file for manual project configuration."""
-    if Path(config_file).exists():
-        return  # Don't overwrite existing config
-    
+    try:
+        f = open(config_file, "x")  # Exclusive create: never overwrite an existing config
+    except FileExistsError:
+        return
+
     config = {}
     for p in projects:
         config[p["full_name"]] = {
@@ -840,7 +1193,7 @@ def save_project_config_template(projects: list, config_file: str = "projects_co
             "description": p.get("description", ""),
         }
     
-    with open(config_file, "w") as f:
+    with f:
         json.dump(config, f, indent=2)
     
     print(f"\n📝 Created {config_file} - edit this file to set goals and progress manually")
@@ -848,17 +1201,21 @@ def save_project_config_template(projects: list, config_file: str = "projects_co
 
 def load_todos(todos_file: str = "todos.json") -> list:
     """Load todos from file."""
-    if Path(todos_file).exists():
-        with open(todos_file) as f:
-            return json.load(f)
-    return []
+    try:
+        with open(todos_file, "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return []
+    return orjson.loads(raw) if orjson else json.loads(raw)
 
 
 def save_todos_template(projects: list, todos_file: str = "todos.json"):
     """Save a template todos file."""
-    if Path(todos_file).exists():
+    try:
+        f = open(todos_file, "x")
+    except FileExistsError:
         return
-    
+
     todos = [
         {
             "id": 1,
@@ -869,7 +1226,7 @@ def save_todos_template(projects: list, todos_file: str = "todos.json"):
         }
     ]
     
-    with open(todos_file, "w") as f:
+    with f:
         json.dump(todos, f, indent=2)
     
     print(f"📝 Created {todos_file} - edit this file to manage your todos")
@@ -887,11 +1244,12 @@ def main():
     parser.add_argument("--fork-repos", help="Comma-separated list of repo names that are forks (LOC excluded but included in other metrics)")
     parser.add_argument("--clone", action="store_true", help="Clone repos for accurate LOC counting")
     parser.add_argument("--output", default=CONFIG["output_file"], help="Output JSON file")
+    parser.add_argument("--compact", action="store_true", help="Write the output JSON without indentation")
     parser.add_argument("--token", help="GitHub token (or set GITHUB_TOKEN env var)")
     args = parser.parse_args()
 
     # Load manual configuration
-    project_config = load_project_config()
+    overrides = project_overrides(load_project_config())
     projects = []
 
     if args.local:
@@ -906,27 +1264,27 @@ def main():
             print(f"📝 Filtering commits by author: {args.author}")
         if args.owner:
             print(f"📁 Filtering repos by owner: {args.owner}")
-        fork_repos = set()
+        fork_repos = frozenset()
         if args.fork_repos:
-            fork_repos = {x.strip().lower() for x in args.fork_repos.split(",") if x.strip()}
+            fork_repos = frozenset(x.strip().lower() for x in args.fork_repos.split(",") if x.strip())
             print(f"🍴 Fork repos (LOC excluded): {', '.join(fork_repos) if fork_repos else 'none'}")
+        excluded = frozenset()
+        if args.exclude:
+            excluded_names = [x.strip().lower() for x in args.exclude.split(",")]
+            print(f"🚫 Excluding repos: {', '.join(excluded_names)}")
+            excluded = frozenset(excluded_names)
+        owner = args.owner.lower() if args.owner else None
         scanner = LocalRepoScanner(local_path, author=args.author)
-        repos = scanner.discover_repos()
 
-        # Filter by owner if specified
-        if args.owner:
-            filtered_repos = []
-            for repo_path in repos:
-                info = scanner.get_repo_info(repo_path)
-                if info.get("owner", "").lower() == args.owner.lower():
-                    filtered_repos.append(repo_path)
-            repos = filtered_repos
-
-        # Filter out excluded repos
-        if args.exclude:
-            excluded = [x.strip().lower() for x in args.exclude.split(",")]
-            print(f"🚫 Excluding repos: {', '.join(excluded)}")
-            repos = [r for r in repos if r.name.lower() not in excluded]
+        # Apply the exclude and owner filters and mark forks in one pass (lowercasing each name once)
+        repos = []  # (repo_path, is_fork)
+        for repo_path in scanner.discover_repos():
+            name = repo_path.name.lower()
+            if name in excluded:
+                continue
+            if owner and scanner.get_owner(repo_path).lower() != owner:
+                continue
+            repos.append((repo_path, name in fork_repos))
 
         if not repos:
             print("❌ No git repositories found in the specified path")
@@ -934,20 +1292,24 @@ def main():
 
         print(f"\n🚀 Processing {len(repos)} local repositories...")
 
-        for repo_path in repos:
+        # Count LOC for all non-fork repos in one LOC tool run where the tool supports it
+        loc_by_repo = count_lines_of_code_many(
+            [repo_path for repo_path, is_fork in repos if not is_fork], CONFIG["loc_tool"])
+
+        # Repos are independent, so scan them in parallel worker processes (git + any remaining LOC counts)
+        tasks = [(local_path, args.author, repo_path, scanner.get_remote_url(repo_path),
+                  is_fork, loc_by_repo.get(repo_path)) for repo_path, is_fork in repos]
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            scanned = list(executor.map(scan_local_repo, tasks))
+
+        for (_, _, repo_path, _, is_fork, _), project in zip(tasks, scanned):
+            if project is None:
+                continue
             try:
-                is_fork = repo_path.name.lower() in fork_repos
-                project = fetch_local_project_data(scanner, repo_path, skip_loc=is_fork)
                 project["is_fork"] = is_fork
 
                 # Apply manual configuration
-                if project["full_name"] in project_config:
-                    config = project_config[project["full_name"]]
-                    project["progress"] = config.get("progress", project["progress"])
-                    project["goals"] = config.get("goals", project["goals"])
-                    project["completed_goals"] = config.get("completed_goals", project["completed_goals"])
-                    if config.get("description"):
-                        project["description"] = config["description"]
+                apply_project_overrides(project, overrides.get(project["full_name"]))
 
                 # Calculate progress if not manually set
                 if project["progress"] == 0:
@@ -996,27 +1358,29 @@ def main():
 
         print(f"\n🚀 Processing {len(repos_to_fetch)} repositories...")
 
-        for owner, repo in repos_to_fetch:
-            try:
-                project = fetch_project_data(fetcher, owner, repo, clone_for_loc=args.clone)
+        # Repos are independent and network-bound, so fetch several at once (the fetcher's
+        # semaphore still caps in-flight requests); results are applied in the original order
+        with ThreadPoolExecutor(max_workers=CONFIG["api_concurrency"]) as executor:
+            futures = [executor.submit(fetch_project_data, fetcher, owner, repo, clone_for_loc=args.clone)
+                       for owner, repo in repos_to_fetch]
 
-                # Apply manual configuration
-                if project["full_name"] in project_config:
-                    config = project_config[project["full_name"]]
-                    project["progress"] = config.get("progress", project["progress"])
-                    project["goals"] = config.get("goals", project["goals"])
-                    project["completed_goals"] = config.get("completed_goals", project["completed_goals"])
-                    if config.get("description"):
-                        project["description"] = config["description"]
+            for (owner, repo), future in zip(repos_to_fetch, futures):
+                try:
+                    project = future.result()
 
-                # Calculate progress if not manually set
-                if project["progress"] == 0:
-                    project["progress"] = calculate_progress(project)
+                    # Apply manual configuration
+                    apply_project_overrides(project, overrides.get(project["full_name"]))
 
-                projects.append(project)
+                    # Calculate progress if not manually set
+                    if project["progress"] == 0:
+                        project["progress"] = calculate_progress(project)
 
-            except Exception as e:
-                print(f"   ❌ Error processing {owner}/{repo}: {e}")
+                    projects.append(project)
+
+                except Exception as e:
+                    print(f"   ❌ Error processing {owner}/{repo}: {e}")
+
+        fetcher.save_etags()
     
     if not projects:
         print("❌ No projects were successfully processed")
@@ -1024,7 +1388,15 @@ def main():
     
     # Calculate aggregate statistics (exclude fork LOC)
     non_fork_projects = [p for p in projects if not p.get("is_fork", False)]
-    total_loc = sum(sum(p.get("loc", {}).values()) for p in non_fork_projects)
+
+    # Total LOC and language breakdown in one pass over each project's LOC (exclude forks)
+    language_totals = defaultdict(int)
+    total_loc = 0
+    for p in non_fork_projects:
+        for lang, lines in p.get("loc", {}).items():
+            language_totals[lang] += lines
+            total_loc += lines
+
     total_commits = sum(p.get("commits", 0) for p in projects)  # Include all commits
     avg_progress = sum(p.get("progress", 0) for p in projects) // len(projects)
     
@@ -1032,32 +1404,27 @@ def main():
     commit_history = aggregate_commit_history(projects)
     
     # Calculate week-over-week trend
-    this_week = sum(d["commits"] for d in commit_history[-7:])
-    last_week = sum(d["commits"] for d in commit_history[-14:-7])
+    recent = [d["commits"] for d in commit_history[-14:]]
+    this_week = sum(recent[-7:])
+    last_week = sum(recent[:-7])
     week_trend = this_week - last_week
     
     # Generate LOC history
     loc_history = generate_loc_history(projects)
     
-    # Language breakdown (exclude forks)
-    language_totals = {}
-    for p in non_fork_projects:
-        for lang, lines in p.get("loc", {}).items():
-            language_totals[lang] = language_totals.get(lang, 0) + lines
-    
     # Load todos
     todos = load_todos()
 
-    # Aggregate releases from all projects, sorted by date
-    all_releases = []
-    for p in projects:
-        all_releases.extend(p.get("releases", []))
-    # Sort by date descending
-    all_releases.sort(key=lambda r: r.get("date", ""), reverse=True)
+    # Aggregate releases from all projects, sorted by date descending: sort each project's short
+    # list, then merge them (stable, so ties keep project order as a full sort would)
+    all_releases = list(heapq.merge(
+        *(sorted(p.get("releases", []), key=lambda r: r.get("date", ""), reverse=True) for p in projects),
+        key=lambda r: r.get("date", ""), reverse=True
+    ))
 
     # Build final output
     output = {
-        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "generated_at": datetime.now(timezone.utc),  # Serialized as ISO-8601
         "stats": {
             "total_loc": total_loc,
             "total_commits": total_commits,
@@ -1068,7 +1435,7 @@ def main():
             "project_count": len(projects),
             "fork_count": len(projects) - len(non_fork_projects),
         },
-        "languages": language_totals,
+        "languages": dict(language_totals),
         "commit_history": commit_history,
         "loc_history": loc_history["total"],
         "loc_history_by_repo": {
@@ -1081,8 +1448,20 @@ def main():
     }
     
     # Write output
-    with open(args.output, "w") as f:
-        json.dump(output, f, indent=2)
+    # Serialize fully in memory (indented by default: the file is committed and diffed, like
+    # loc_history.json), then write via a temp file and rename so the dashboard never sees a partial file
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        data = orjson.dumps(output, option=option if args.compact else option | orjson.OPT_INDENT_2)
+    else:
+        layout = {"separators": (",", ":")} if args.compact else {"indent": 2}
+        data = (json.dumps(output, default=datetime.isoformat, **layout) + "\n").encode()
+    output_path = Path(args.output).resolve()
+    with tempfile.NamedTemporaryFile(dir=output_path.parent, prefix=f".{output_path.name}.",
+                                     delete=False) as f:
+        f.write(data)
+    os.chmod(f.name, 0o644)  # NamedTemporaryFile creates owner-only files
+    os.replace(f.name, output_path)
     
     print(f"\n✅ Dashboard data saved to {args.output}")
     fork_count = len(projects) - len(non_fork_projects)
@@ -5,95 +5,141 @@ Generates claude_stats.json with user prompt counts instead of total messages.
 """
 
 import json
+import mmap
 import os
 from pathlib import Path
 from datetime import datetime
-from collections import defaultdict
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+try:
+    import orjson  # Optional: much faster decoding of session lines
+except ImportError:
+    orjson = None
 
 CLAUDE_DIR = Path.home() / ".claude"
 PROJECTS_DIR = CLAUDE_DIR / "projects"
 STATS_CACHE = CLAUDE_DIR / "stats-cache.json"
 
 def parse_session_file(filepath):
-    """Parse a single session .jsonl file and count user prompts."""
-    user_prompts = []
+    """Parse a single session .jsonl file and count user prompts.
+
+    Returns (prompt count, Counter of local dates, Counter of local hours).
+    """
+    prompt_count = 0
+    dates = []
+    hours = []
 
     try:
-        with open(filepath, 'r') as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                try:
-                    entry = json.loads(line)
-                    # User prompts have type="user" and userType="external"
-                    # and message.content with text (not tool_result)
-                    if (entry.get('type') == 'user' and
-                        entry.get('userType') == 'external' and
-                        entry.get('message', {}).get('role') == 'user'):
-
-                        content = entry.get('message', {}).get('content', [])
-                        # Check if it's actual user text, not a tool result
-                        if isinstance(content, list):
-                            has_text = any(c.get('type') == 'text' for c in content)
-                            has_tool_result = any(c.get('type') == 'tool_result' for c in content)
-                            if has_text and not has_tool_result:
-                                timestamp = entry.get('timestamp')
-                                if timestamp:
-                                    user_prompts.append(timestamp)
-                        elif isinstance(content, str) and content.strip():
-                            timestamp = entry.get('timestamp')
-                            if timestamp:
-                                user_prompts.append(timestamp)
-                except json.JSONDecodeError:
-                    continue
+        # Read whole (session files are small) and split in C; both parsers take bytes,
+        # so lines are never decoded to str first
+        data = Path(filepath).read_bytes()
+        for line in data.split(b'\n'):
+            # Transcript records ({"parentUuid":...) put their "type" key before "message",
+            # so the type check only has to scan the short header, not a long message body
+            header_end = line.find(b'"message":') if line.startswith(b'{"parentUuid"') else -1
+            if header_end < 0:
+                header_end = len(line)
+            # Session files are compact JSON, so any user prompt line contains both of these;
+            # a substring check rejects assistant/tool lines (and blank ones) without parsing
+            if line.find(b'"type":"user"', 0, header_end) < 0 or b'"userType":"external"' not in line:
+                continue
+            try:
+                entry = orjson.loads(line) if orjson else json.loads(line)
+                # User prompts have type="user" and userType="external"
+                # and message.content with text (not tool_result)
+                if (entry.get('type') == 'user' and
+                    entry.get('userType') == 'external' and
+                    entry.get('message', {}).get('role') == 'user'):
+
+                    content = entry.get('message', {}).get('content', [])
+                    # Check if it's actual user text, not a tool result
+                    if isinstance(content, list):
+                        has_text = any(c.get('type') == 'text' for c in content)
+                        has_tool_result = any(c.get('type') == 'tool_result' for c in content)
+                        is_prompt = has_text and not has_tool_result
+                    else:
+                        is_prompt = isinstance(content, str) and content.strip()
+
+                    timestamp = entry.get('timestamp')
+                    if is_prompt and timestamp:
+                        prompt_count += 1
+                        local = prompt_date_hour(timestamp)
+                        if local:
+                            dates.append(local[0])
+                            hours.append(local[1])
+            except json.JSONDecodeError:
+                continue
     except Exception as e:
         print(f"Error reading {filepath}: {e}")
 
-    return user_prompts
+    # Counter's constructor tallies an iterable in C
+    return prompt_count, Counter(dates), Counter(hours)
+
+def prompt_date_hour(ts):
+    """Local (date, hour) of a prompt's UTC timestamp, or None if it can't be parsed."""
+    try:
+        if ts.endswith('Z'):
+            # "YYYY-MM-DDTHH:MM" fixes the local date/hour in any timezone, and prompts
+            # cluster, so most timestamps are a cache hit instead of a datetime parse
+            return local_date_hour(ts[:16])
+        dt_local = datetime.fromisoformat(ts).astimezone()
+        return dt_local.strftime('%Y-%m-%d'), dt_local.hour
+    except (AttributeError, ValueError):
+        return None
+
+@lru_cache(maxsize=None)
+def local_date_hour(utc_minute):
+    """Local (date, hour) for a UTC "YYYY-MM-DDTHH:MM" timestamp prefix."""
+    dt_local = datetime.fromisoformat(utc_minute + '+00:00').astimezone()
+    return dt_local.strftime('%Y-%m-%d'), dt_local.hour
+
+def load_stats_cache():
+    """Load Claude's stats-cache.json ({} if missing), parsing it straight from a memory map."""
+    try:
+        with open(STATS_CACHE, 'rb') as f:
+            if not orjson:
+                return json.load(f)
+            # orjson reads the mapped pages directly: no read() copy of a multi-MB file
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+    except FileNotFoundError:
+        return {}
 
 def main():
     # Load existing stats-cache for base data
-    if STATS_CACHE.exists():
-        with open(STATS_CACHE) as f:
-            stats = json.load(f)
-    else:
-        stats = {}
-
-    # Collect all user prompts with timestamps
-    all_prompts = []
+    stats = load_stats_cache()
 
     # Scan all project directories
+    session_files = []
+    project_count = 0
     if PROJECTS_DIR.exists():
         for project_dir in PROJECTS_DIR.iterdir():
             if project_dir.is_dir():
-                for session_file in project_dir.glob("*.jsonl"):
-                    prompts = parse_session_file(session_file)
-                    all_prompts.extend(prompts)
-
-    # Group by date (convert UTC to local time)
-    prompts_by_date = defaultdict(int)
-    prompts_by_hour = defaultdict(int)
-
-    for ts in all_prompts:
-        try:
-            # Parse UTC timestamp and convert to local time
-            dt_utc = datetime.fromisoformat(ts.replace('Z', '+00:00'))
-            dt_local = dt_utc.astimezone()  # Convert to local timezone
-            date_str = dt_local.strftime('%Y-%m-%d')
-            hour = dt_local.hour
-            prompts_by_date[date_str] += 1
-            prompts_by_hour[hour] += 1
-        except:
-            continue
+                project_count += 1
+                session_files.extend(project_dir.glob("*.jsonl"))
+
+    # Session files are independent and parsing is CPU-bound, so spread them across processes;
+    # each returns its prompts already grouped by local date and hour
+    total_prompts = 0
+    prompts_by_date = Counter()
+    prompts_by_hour = Counter()
+    with ProcessPoolExecutor() as executor:
+        for count, by_date, by_hour in executor.map(parse_session_file, session_files, chunksize=8):
+            total_prompts += count
+            prompts_by_date.update(by_date)
+            prompts_by_hour.update(by_hour)
 
     # Build daily activity with user prompts
+    # Index original stats by date for session/tool counts (first entry wins, as in a linear search)
+    original_by_date = {}
+    for d in stats.get('dailyActivity', []):
+        original_by_date.setdefault(d.get('date'), d)
+
     daily_activity = []
     for date_str in sorted(prompts_by_date.keys()):
-        # Find matching entry in original stats for session/tool counts
-        original = next(
-            (d for d in stats.get('dailyActivity', []) if d.get('date') == date_str),
-            {}
-        )
+        original = original_by_date.get(date_str, {})
         daily_activity.append({
             'date': date_str,
             'userPrompts': prompts_by_date[date_str],
@@ -106,7 +152,7 @@ def main():
     output = {
         'version': 1,
         'lastComputedDate': datetime.now().strftime('%Y-%m-%d'),
-        'totalUserPrompts': len(all_prompts),
+        'totalUserPrompts': total_prompts,
         'totalSessions': stats.get('totalSessions', 0),
         'totalMessages': stats.get('totalMessages', 0),
         'firstSessionDate': stats.get('firstSessionDate'),
@@ -118,10 +164,14 @@ def main():
 
     # Write output
     output_path = Path(__file__).parent / 'claude_stats.json'
-    with open(output_path, 'w') as f:
-        json.dump(output, f, indent=2)
+    if orjson:
+        data = orjson.dumps(output, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(output, indent=2).encode()
+    with open(output_path, 'wb') as f:
+        f.write(data)
 
-    print(f"Parsed {len(all_prompts)} user prompts from {len(list(PROJECTS_DIR.iterdir()))} projects")
+    print(f"Parsed {total_prompts} user prompts from {project_count} projects")
     print(f"Written to {output_path}")
 
 if __name__ == '__main__':